@@ -1,20 +1,75 @@
-import os
-import logging
-from typing import Dict, Any, List
-from fastmcp import FastMCP, Message
+import functools
+from typing import Any
+from fastmcp import FastMCP
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
-logger = logging.getLogger(__name__)
+# All logging goes through the shared StructuredLogger, which configures its
+# own handlers; configuring the root logger here as well would leave a second
+# handler that every record also traverses. The relative import keeps this
+# module on the same src.utils.logger instance the webhook package uses — a
+# bare `utils.logger` import would create a second module object that
+# reconfigures the shared logger.
+from .utils.logger import logger
 
 # Initialize FastMCP
 mcp = FastMCP(title="SoberBookings MCP Server")
 
+# Mock response templates, built once at import. The tool handlers used to
+# rebuild these nested literals on every call; hoisting them means repeat
+# invocations allocate nothing. The handlers never mutate them, and the MCP
+# layer serializes responses, so sharing the structures is safe.
+_MOCK_FACILITIES = [
+    {
+        "id": "1",
+        "name": "Recovery Center of Excellence",
+        "location": "Los Angeles, CA",
+        "insurance": ["Aetna", "Blue Cross", "Cigna"],
+        "treatments": ["Detox", "Inpatient", "IOP"],
+        "rating": 4.8,
+    },
+    {
+        "id": "2",
+        "name": "Serenity Treatment Center",
+        "location": "San Diego, CA",
+        "insurance": ["Blue Cross", "United Healthcare"],
+        "treatments": ["Outpatient", "IOP", "PHP"],
+        "rating": 4.6,
+    }
+]
+
+_MOCK_COVERAGE = {
+    "inpatient": "80%",
+    "outpatient": "90%",
+    "detox": "70%",
+    "medication": "Covered with $20 copay"
+}
+
+_MOCK_ASSESSMENT = {
+    "risk_level": "Moderate",
+    "recommended_care": ["Intensive Outpatient", "Individual Therapy"],
+    "asam_criteria": {
+        "dimension1": "Minimal risk of withdrawal",
+        "dimension2": "No biomedical conditions requiring treatment",
+        "dimension3": "Moderate emotional/behavioral conditions",
+        "dimension4": "Ready for change",
+        "dimension5": "Continued use risk without monitoring",
+        "dimension6": "Supportive recovery environment with assistance"
+    },
+    "next_steps": [
+        "Schedule assessment with treatment provider",
+        "Gather insurance information",
+        "Prepare list of current medications"
+    ]
+}
+
+@functools.lru_cache(maxsize=512)
+def _search_facilities_cached(query: str, location: str, insurance: str) -> list[dict[str, Any]]:
+    """Resolve a facility search; repeated identical queries hit the cache."""
+    # This would connect to the actual search service
+    # For now, return mock data
+    return _MOCK_FACILITIES
+
 @mcp.tool()
-async def search_facilities(query: str, location: str = None, insurance: str = None) -> List[Dict[str, Any]]:
+async def search_facilities(query: str, location: str = None, insurance: str = None) -> list[dict[str, Any]]:
     """
     Search for treatment facilities based on user query and optional filters.
     
@@ -26,33 +81,12 @@ async def search_facilities(query: str, location: str = None, insurance: str = N
     Returns:
         List of matching facilities with details
     """
-    logger.info(f"Searching facilities with query: {query}, location: {location}, insurance: {insurance}")
-    
-    # This would connect to the actual search service
-    # For now, return mock data
-    facilities = [
-        {
-            "id": "1",
-            "name": "Recovery Center of Excellence",
-            "location": "Los Angeles, CA",
-            "insurance": ["Aetna", "Blue Cross", "Cigna"],
-            "treatments": ["Detox", "Inpatient", "IOP"],
-            "rating": 4.8,
-        },
-        {
-            "id": "2",
-            "name": "Serenity Treatment Center",
-            "location": "San Diego, CA",
-            "insurance": ["Blue Cross", "United Healthcare"],
-            "treatments": ["Outpatient", "IOP", "PHP"],
-            "rating": 4.6,
-        }
-    ]
-    
-    return facilities
+    logger.info("Searching facilities", query=query, location=location, insurance=insurance)
+
+    return _search_facilities_cached(query, location, insurance)
 
 @mcp.tool()
-async def verify_insurance(provider: str, policy_number: str) -> Dict[str, Any]:
+async def verify_insurance(provider: str, policy_number: str) -> dict[str, Any]:
     """
     Verify insurance coverage for addiction treatment services.
     
@@ -63,25 +97,19 @@ async def verify_insurance(provider: str, policy_number: str) -> Dict[str, Any]:
     Returns:
         Coverage details for addiction treatment
     """
-    logger.info(f"Verifying insurance: {provider}, policy: {policy_number}")
-    
+    logger.info("Verifying insurance", provider=provider, policy_number=policy_number)
+
     # This would connect to the actual insurance verification service
-    # For now, return mock data
-    coverage = {
+    # For now, return mock data. Only the thin outer dict varies per call;
+    # the coverage details are the shared module-level template.
+    return {
         "verified": True,
         "provider": provider,
         "policy_number": policy_number,
-        "coverage": {
-            "inpatient": "80%",
-            "outpatient": "90%",
-            "detox": "70%",
-            "medication": "Covered with $20 copay"
-        },
+        "coverage": _MOCK_COVERAGE,
         "deductible": "$1,500 remaining",
         "out_of_pocket_max": "$5,000 per year"
     }
-    
-    return coverage
 
 @mcp.tool()
 async def intake_assessment(
@@ -90,7 +118,7 @@ async def intake_assessment(
     substance: str, 
     usage_frequency: str,
     previous_treatment: bool = False
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     """
     Perform an initial intake assessment to determine appropriate level of care.
     
@@ -104,34 +132,17 @@ async def intake_assessment(
     Returns:
         Assessment results and recommendations
     """
-    logger.info(f"Performing intake assessment for {name}, age {age}")
-    
+    logger.info("Performing intake assessment", name=name, age=age)
+
     # This would connect to the actual assessment service
     # For now, return mock data
-    assessment = {
-        "risk_level": "Moderate",
-        "recommended_care": ["Intensive Outpatient", "Individual Therapy"],
-        "asam_criteria": {
-            "dimension1": "Minimal risk of withdrawal",
-            "dimension2": "No biomedical conditions requiring treatment",
-            "dimension3": "Moderate emotional/behavioral conditions",
-            "dimension4": "Ready for change",
-            "dimension5": "Continued use risk without monitoring",
-            "dimension6": "Supportive recovery environment with assistance"
-        },
-        "next_steps": [
-            "Schedule assessment with treatment provider",
-            "Gather insurance information",
-            "Prepare list of current medications"
-        ]
-    }
-    
-    return assessment
+    return _MOCK_ASSESSMENT
 
 # Run the MCP server
 if __name__ == "__main__":
-    # For local development
+    # For local development: `python -m src.server` from backend/
+    # (package context is required for the relative imports above)
     mcp.run(host="0.0.0.0", port=8000)
 else:
-    # For production with UV
-    app = mcp.app 
\ No newline at end of file
+    # For production with UV: `uvicorn src.server:app` from backend/
+    app = mcp.app
@@ -1,9 +1,147 @@
+import atexit
+import io
 import logging
-import json
+import logging.handlers
 import os
+import queue
 import sys
+import time
 from datetime import datetime
 
+# orjson serializes in native code and is roughly 2x faster than stdlib json
+# on the small dicts we log; fall back to stdlib when it is not installed.
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj)
+
+class FastFormatter(logging.Formatter):
+    """Formatter that caches the strftime result at second granularity.
+
+    Formatter.formatTime calls localtime() + strftime() per record, which
+    dominates formatting cost during log bursts. Records landing in the same
+    second reuse the cached string and only append their milliseconds. Records
+    are formatted on the single queue-listener thread, so the two-slot cache
+    needs no locking.
+
+    Structured metadata attached by StructuredLogger (record.structured) is
+    serialized here, at emission time, so records dropped by a handler level
+    never pay for JSON encoding.
+    """
+
+    _last_sec = 0
+    _last_str = ""
+
+    def format(self, record):
+        structured = getattr(record, 'structured', None)
+        if not structured:
+            return super().format(record)
+        # Fold the structured suffix into the message line (not after any
+        # exception traceback), restoring the record afterwards since the
+        # same record may pass through both the console and file handlers.
+        original_msg, original_args = record.msg, record.args
+        try:
+            record.msg = f"{record.getMessage()} | {_dumps(structured)}"
+            record.args = None
+            return super().format(record)
+        finally:
+            record.msg, record.args = original_msg, original_args
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        if sec != self._last_sec:
+            FastFormatter._last_sec = sec
+            FastFormatter._last_str = time.strftime(
+                self.default_time_format, time.localtime(sec)
+            )
+        return f"{self._last_str},{int(record.msecs):03d}"
+
+
+class _BufferedEmitMixin:
+    """Suppress StreamHandler's per-record flush.
+
+    Flushing after every record would defeat the write buffering — and for
+    the layered console stream it only drains one buffer layer anyway.
+    Records stay in the stream buffers until FlushingMemoryHandler drains
+    them with a full flush.
+    """
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class BufferedStreamHandler(_BufferedEmitMixin, logging.StreamHandler):
+    """StreamHandler whose flush() drains every layer down to the OS.
+
+    The console stream stacks a TextIOWrapper and BufferedWriter on top of
+    sys.stdout.buffer, which is itself buffered. Flushing only the wrapper
+    leaves bytes stalled in the stdout buffer — invisible on a pipe or a
+    non-tty container log until the process exits, and lost outright on a
+    hard crash — so flush() also drains the raw stream underneath.
+    """
+
+    def __init__(self, stream, raw_stream=None):
+        super().__init__(stream)
+        self._raw_stream = raw_stream
+
+    def flush(self):
+        super().flush()
+        if self._raw_stream is not None:
+            self._raw_stream.flush()
+
+
+class FlushingMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes its target when it drains.
+
+    The stock flush() emits buffered records into the target handler but
+    never calls target.flush(), so with buffered streams underneath nothing
+    would ever reach the OS. Flushing the target here is what turns the
+    WARNING flushLevel into an actual promptness guarantee.
+    """
+
+    def flush(self):
+        super().flush()
+        if self.target is not None:
+            self.target.flush()
+
+
+class BufferedFileHandler(_BufferedEmitMixin, logging.FileHandler):
+    """FileHandler without the per-record flush.
+
+    The file object opened by FileHandler is already buffered (text wrapper
+    over a BufferedWriter over FileIO); it was the per-record flush that
+    forced a write syscall per record. flush() needs no override here since
+    the file object's own flush reaches the OS.
+    """
+
+
+class PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records unformatted.
+
+    The stock prepare() formats the record on the calling thread, which would
+    pull message interpolation, JSON encoding, and traceback rendering back
+    onto the event loop. The queue never leaves this process, so the record
+    can cross it as-is and be formatted by the listener thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+
 class StructuredLogger:
     """
     Structured logger for consistent logging format across the application.
@@ -16,53 +154,97 @@ class StructuredLogger:
         
         # Clear existing handlers if any
         self.logger.handlers = []
-        
-        # Create console handler
-        console_handler = logging.StreamHandler(sys.stdout)
+
+        # Create console handler. Writing each record straight to sys.stdout
+        # costs one or two write() syscalls per log call; a BufferedWriter
+        # coalesces records into 64 KB chunks instead.
+        console_stream = io.TextIOWrapper(
+            io.BufferedWriter(sys.stdout.buffer, buffer_size=65536),
+            write_through=False,
+        )
+        console_handler = BufferedStreamHandler(
+            console_stream, raw_stream=sys.stdout.buffer
+        )
         console_handler.setLevel(level)
-        
+
         # Create formatter
-        formatter = logging.Formatter(
+        formatter = FastFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         console_handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        self.logger.addHandler(console_handler)
-        
+
+        handlers = [self._buffered(console_handler)]
+
         # Add file handler if LOG_FILE env var is set
         log_file = os.environ.get('LOG_FILE')
         if log_file:
-            file_handler = logging.FileHandler(log_file)
+            file_handler = BufferedFileHandler(log_file)
             file_handler.setLevel(level)
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-    
-    def _format_log(self, message, **kwargs):
-        """Format log message with additional context."""
-        if kwargs:
-            return f"{message} | {json.dumps(kwargs)}"
-        return message
+            handlers.append(self._buffered(file_handler))
+
+        # The logger itself only enqueues records; a dedicated listener
+        # thread drains the queue into the real handlers. This keeps the
+        # async MCP tool handlers from ever blocking the event loop on
+        # stdout or file I/O — their cost is a single queue.put.
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(PassthroughQueueHandler(log_queue))
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._listener.stop)
+
+    @staticmethod
+    def _buffered(handler):
+        """Wrap a handler in a MemoryHandler so INFO records coalesce.
+
+        Records accumulate in memory and flush when the buffer fills or a
+        WARNING-or-higher record arrives, so errors are never held back.
+        Buffers are flushed at interpreter exit so shutdown loses nothing.
+        """
+        memory_handler = FlushingMemoryHandler(
+            capacity=1024,
+            flushLevel=logging.WARNING,
+            target=handler,
+        )
+        atexit.register(memory_handler.flush)
+        return memory_handler
     
-    def info(self, message, **kwargs):
+    # Messages use lazy %-style formatting: `logger.info("got %s", x)` defers
+    # the string interpolation and the JSON encoding of kwargs to the
+    # formatter, so records filtered by level allocate nothing — a filtered
+    # debug() costs one attribute lookup and a branch.
+
+    @staticmethod
+    def _extra(kwargs):
+        """Carry structured kwargs on the record for FastFormatter to emit."""
+        return {'structured': kwargs} if kwargs else None
+
+    def info(self, message, *args, **kwargs):
         """Log info message with structured metadata."""
-        self.logger.info(self._format_log(message, **kwargs))
-    
-    def warning(self, message, **kwargs):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, extra=self._extra(kwargs))
+
+    def warning(self, message, *args, **kwargs):
         """Log warning message with structured metadata."""
-        self.logger.warning(self._format_log(message, **kwargs))
-    
-    def error(self, message, exc_info=None, **kwargs):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, extra=self._extra(kwargs))
+
+    def error(self, message, *args, exc_info=None, **kwargs):
         """Log error message with structured metadata and optional exception info."""
-        self.logger.error(self._format_log(message, **kwargs), exc_info=exc_info)
-    
-    def debug(self, message, **kwargs):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, *args, exc_info=exc_info, extra=self._extra(kwargs))
+
+    def debug(self, message, *args, **kwargs):
         """Log debug message with structured metadata."""
-        self.logger.debug(self._format_log(message, **kwargs))
-    
-    def critical(self, message, exc_info=None, **kwargs):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, extra=self._extra(kwargs))
+
+    def critical(self, message, *args, exc_info=None, **kwargs):
         """Log critical message with structured metadata and optional exception info."""
-        self.logger.critical(self._format_log(message, **kwargs), exc_info=exc_info)
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical(message, *args, exc_info=exc_info, extra=self._extra(kwargs))
 
 # Create a default logger instance
 logger = StructuredLogger("soberbookings")